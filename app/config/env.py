@@ -1,3 +1,5 @@
+import base64
+import binascii
 import os
 
 try:
@@ -8,6 +10,9 @@ try:
 except ImportError:
     pass
 
+# Snapshot of the environment, read once instead of on every lookup
+_ENV = dict(os.environ)
+
 _REQUIRED_VARS = [
     "DB_USER",
     "DB_PASSWORD",
@@ -19,24 +24,48 @@ _REQUIRED_VARS = [
     "SECRET_FERNET_KEY"
 ]
 
-_missing = [name for name in _REQUIRED_VARS if not os.getenv(name)]
+_missing = [name for name in _REQUIRED_VARS if not _ENV.get(name)]
 if _missing:
     raise EnvironmentError(
         f"Missing required environment variables: {', '.join(_missing)}"
     )
 
 # --- Database ---
-DB_USER = os.environ["DB_USER"]
-DB_PASSWORD = os.environ["DB_PASSWORD"]
-DB_HOST = os.environ["DB_HOST"]
-DB_PORT = int(os.environ["DB_PORT"])
-DB_NAME = os.environ["DB_NAME"]
+DB_USER = _ENV["DB_USER"]
+DB_PASSWORD = _ENV["DB_PASSWORD"]
+DB_HOST = _ENV["DB_HOST"]
+DB_PORT = int(_ENV["DB_PORT"])
+DB_NAME = _ENV["DB_NAME"]
 
 # --- GCP ---
-GCP_PROJECT_ID = os.environ["GCP_PROJECT_ID"]
-GCS_BUCKET_NAME = os.environ["GCS_BUCKET_NAME"]
-SECRET_FERNET_KEY = bytes(os.environ["SECRET_FERNET_KEY"], "utf-8")
+GCP_PROJECT_ID = _ENV["GCP_PROJECT_ID"]
+GCS_BUCKET_NAME = _ENV["GCS_BUCKET_NAME"]
+SECRET_FERNET_KEY = bytes(_ENV["SECRET_FERNET_KEY"], "utf-8")
+
+# --- Encryption ---
+ENCRYPTION_ALGORITHM = _ENV.get("ENCRYPTION_ALGORITHM", "fernet").lower()
+
+if ENCRYPTION_ALGORITHM not in ("fernet", "aesgcm"):
+    raise EnvironmentError(
+        f"Invalid ENCRYPTION_ALGORITHM '{ENCRYPTION_ALGORITHM}', expected 'fernet' or 'aesgcm'"
+    )
+
+# AES-256 key, decoded from URL-safe base64. Only read when AES-GCM is enabled.
+SECRET_AES_KEY: bytes | None = None
+if ENCRYPTION_ALGORITHM == "aesgcm":
+    if not _ENV.get("SECRET_AES_KEY"):
+        raise EnvironmentError("Missing required environment variables: SECRET_AES_KEY")
+    try:
+        SECRET_AES_KEY = base64.urlsafe_b64decode(_ENV["SECRET_AES_KEY"])
+    except (binascii.Error, ValueError):
+        raise EnvironmentError("SECRET_AES_KEY is not valid URL-safe base64") from None
+    if len(SECRET_AES_KEY) != 32:
+        raise EnvironmentError(
+            f"SECRET_AES_KEY must decode to 32 bytes, got {len(SECRET_AES_KEY)}"
+        )
 
 # --- Extraction Values with Defaults ---
-EXECUTION_TS = os.getenv("EXECUTION_TS", "1900-01-01 00:00:00.000000")
-CLOUD_RUN_TASK_INDEX = int(os.getenv("CLOUD_RUN_TASK_INDEX", "0"))
+EXECUTION_TS = _ENV.get("EXECUTION_TS", "1900-01-01 00:00:00.000000")
+CLOUD_RUN_TASK_INDEX = int(_ENV.get("CLOUD_RUN_TASK_INDEX", "0"))
+LOADER_MAX_WORKERS = int(_ENV.get("LOADER_MAX_WORKERS", "4"))
+TASK_STRIDE = max(1, int(_ENV.get("TASK_STRIDE", "1")))
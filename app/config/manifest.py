@@ -1,11 +1,21 @@
 from google.cloud import storage
-import json
-from typing import List, Dict
+import orjson
+from typing import List, Dict, NamedTuple
 
 from config import env
 from utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
+
+
+class TaskConfig(NamedTuple):
+    """Settings of a single job from the manifest."""
+
+    schema_name: str
+    table_name: str
+    cursor_column: str
+    chunk_size: int = 1_000_000
+    num_partitions: int = 1
 
 
 def get_manifest_json(storage_client: storage.Client) -> List[Dict]:
@@ -22,11 +32,31 @@ def get_manifest_json(storage_client: storage.Client) -> List[Dict]:
 
     try:
         manifest_blob = storage_client.bucket(bucket_name).blob(file_path)
-        job_list_json = manifest_blob.download_as_string().decode("utf-8")
-        job_list = json.loads(job_list_json)
-        logger.info(f"Manifest loaded with {len(job_list)} jobs.")
+        job_list = orjson.loads(manifest_blob.download_as_bytes())
+        logger.info("Manifest loaded with %d jobs.", len(job_list))
         return job_list
 
     except Exception:
         logger.error("Error reading manifest from GCS.", exc_info=True)
         raise
+
+
+def parse_task_item(task_item: Dict) -> TaskConfig:
+    """Unpacks a manifest job into a TaskConfig.
+
+    Args:
+        task_item: A dictionary representing a job from the manifest.
+
+    Returns:
+        The job settings, with defaults applied to the optional keys.
+
+    Raises:
+        KeyError: If a required key is missing from the job.
+    """
+    return TaskConfig(
+        schema_name=str(task_item["schema_name"]),
+        table_name=str(task_item["table_name"]),
+        cursor_column=str(task_item["cursor_column"]),
+        chunk_size=int(task_item.get("chunk_size", 1_000_000)),
+        num_partitions=int(task_item.get("num_partitions", 1)),
+    )
@@ -1,109 +1,241 @@
-import pandas as pd
-from sqlalchemy import Engine
-from typing import Generator
+import connectorx as cx
+import pyarrow as pa
+import pyarrow.compute as pc
+from datetime import datetime
+from typing import Any, Generator
 
 from utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 class SQLServerExtractor:
     """
     Extracts data from a SQL Server table in incremental chunks.
 
-    This class connects to a SQL Server database using a SQLAlchemy engine
-    and yields data in pandas DataFrames, suitable for processing large tables
-    without loading the entire dataset into memory.
+    This class reads from SQL Server through ConnectorX, which decodes rows
+    straight into Arrow record batches, and yields data in PyArrow Tables,
+    suitable for processing large tables without loading the entire dataset
+    into memory.
     """
 
     def __init__(
         self,
-        engine: Engine,
+        connection_url: str,
         columns_to_select: list[str],
         schema_name: str,
         table_name: str,
         cursor_column: str,
         chunk_size: int = 1_000_000,
+        num_partitions: int = 1,
     ) -> None:
         """
         Initializes the SQLServerExtractor.
 
         Args:
-            engine: An authenticated SQLAlchemy engine instance for the SQL Server database.
+            connection_url: The ConnectorX connection URL for the SQL Server database.
             columns_to_select: List of columns to use in select query.
             schema_name: The name of the database schema.
             table_name: The name of the table to extract data from.
             cursor_column: The name of the column to use as a cursor for incremental extraction.
             chunk_size: The number of rows to fetch in each chunk. Defaults to 1,000,000.
+            num_partitions: The number of cursor ranges to read in parallel. Defaults to 1.
         """
-        self.engine = engine
+        self.connection_url = connection_url
         self.columns_to_select = columns_to_select
         self.schema_name = schema_name
         self.table_name = table_name
         self.cursor_column = cursor_column
         self.chunk_size = chunk_size
+        self.num_partitions = num_partitions
 
-    def _build_incremental_query(self) -> str:
+    @staticmethod
+    def _format_cursor(cursor: str | datetime) -> str:
         """
-        Builds a parameterized SQL query for incremental data extraction.
+        Renders a cursor value as a SQL Server timestamp literal.
 
-        The query selects rows where the cursor column is greater than the
-        bound parameter marker "?" (pyodbc/qmark paramstyle) and orders results ascending by the
-        cursor column.
+        ConnectorX does not support bound parameters, so the cursor is parsed
+        as a timestamp and rendered back with millisecond precision, which
+        rejects anything that is not a valid timestamp before it reaches the
+        SQL text.
+
+        Args:
+            cursor: The cursor value, as an ISO formatted string or a datetime.
+
+        Returns:
+            The cursor formatted as 'YYYY-MM-DD HH:MM:SS.mmm'.
+
+        Raises:
+            ValueError: If the cursor is not a valid ISO formatted timestamp.
+        """
+        if isinstance(cursor, str):
+            cursor = datetime.fromisoformat(cursor)
+        return cursor.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+    def _build_incremental_query(
+        self, last_cursor: str, upper_cursor: str | None = None
+    ) -> str:
+        """
+        Builds the SQL query for incremental data extraction.
+
+        The query selects rows where the cursor column is greater than or equal
+        to the last cursor (and lower than the upper cursor, when given) and
+        orders results ascending by the cursor column.
+
+        Args:
+            last_cursor: The starting cursor value for the incremental query.
+            upper_cursor: The exclusive upper cursor value. Defaults to None (unbounded).
 
         Returns:
-            The SQL query string with a single positional parameter marker ("?").
+            The SQL query string with the cursors rendered as timestamp literals.
+
+        Raises:
+            ValueError: If a cursor is not a valid ISO formatted timestamp.
         """
         columns = ", ".join(f"[{c}]" for c in self.columns_to_select)
+        condition = f"[{self.cursor_column}] >= '{self._format_cursor(last_cursor)}'"
+        if upper_cursor is not None:
+            condition += (
+                f" AND [{self.cursor_column}] < '{self._format_cursor(upper_cursor)}'"
+            )
 
         query = f"""
             SELECT {columns}
             FROM [{self.schema_name}].[{self.table_name}]
-            WHERE [{self.cursor_column}] >= ?
+            WHERE {condition}
             ORDER BY [{self.cursor_column}] ASC
             """
         return query
 
+    def _get_cursor_bounds(
+        self, last_cursor: str
+    ) -> tuple[datetime | None, datetime | None]:
+        """
+        Fetches the lowest and highest cursor values still to be extracted.
+
+        Args:
+            last_cursor: The starting cursor value for the incremental query.
+
+        Returns:
+            A tuple with the min and max cursor values, both None if there is no new data.
+        """
+        query = f"""
+            SELECT MIN([{self.cursor_column}]) AS lower_bound,
+                   MAX([{self.cursor_column}]) AS upper_bound
+            FROM [{self.schema_name}].[{self.table_name}]
+            WHERE [{self.cursor_column}] >= '{self._format_cursor(last_cursor)}'
+            """
+        bounds = cx.read_sql(
+            self.connection_url, query, return_type="arrow", protocol="binary"
+        )
+        return bounds["lower_bound"][0].as_py(), bounds["upper_bound"][0].as_py()
+
+    def _build_partitioned_queries(self, last_cursor: str) -> list[str]:
+        """
+        Splits the incremental query into contiguous cursor ranges.
+
+        The range between the min and max pending cursor values is divided in
+        `num_partitions` equal strides. The first range starts at the last
+        cursor and the last one is left unbounded, so together they select
+        exactly the same rows as the single incremental query.
+
+        Args:
+            last_cursor: The starting cursor value for the incremental query.
+
+        Returns:
+            A list of SQL queries, one per partition.
+        """
+        if self.num_partitions <= 1:
+            return [self._build_incremental_query(last_cursor)]
+
+        lower_bound, upper_bound = self._get_cursor_bounds(last_cursor)
+        if lower_bound is None or upper_bound is None or lower_bound == upper_bound:
+            return [self._build_incremental_query(last_cursor)]
+
+        stride = (upper_bound - lower_bound) / self.num_partitions
+        lower_cursors = [last_cursor] + [
+            self._format_cursor(lower_bound + stride * k)
+            for k in range(1, self.num_partitions)
+        ]
+        upper_cursors: list[str | None] = [*lower_cursors[1:], None]
+
+        return [
+            self._build_incremental_query(lower, upper)
+            for lower, upper in zip(lower_cursors, upper_cursors)
+        ]
+
+    def _get_tail_cursor(self, batch: pa.RecordBatch) -> Any:
+        """
+        Reads the cursor value of the last row of a batch.
+
+        Rows are ordered by the cursor within each batch, so the last row holds
+        its max cursor. Timestamps are truncated to millisecond precision, the
+        precision the cursor is saved with.
+
+        Args:
+            batch: A non-empty record batch read from the database.
+
+        Returns:
+            The cursor value of the last row, as a Python object.
+        """
+        tail = batch.column(self.cursor_column).slice(batch.num_rows - 1)
+        if pa.types.is_timestamp(tail.type):
+            tail = pc.cast(tail, pa.timestamp("ms"), safe=False)
+        return tail[0].as_py()
+
     def extract_chunks(
         self, last_cursor: str
-    ) -> Generator[tuple[int, pd.DataFrame], None, None]:
+    ) -> Generator[tuple[int, pa.Table, Any], None, None]:
         """
         Extracts data from the database and yields it in chunks.
 
-        This is a generator method that executes the incremental query and
-        yields each chunk as a pandas DataFrame.
+        This is a generator method that streams the incremental query as Arrow
+        record batches of up to `chunk_size` rows and yields each chunk as a
+        PyArrow Table, without any pandas conversion. When `num_partitions` is
+        greater than 1, ConnectorX reads each cursor range over its own
+        connection in parallel and chunks from different ranges are interleaved,
+        so chunks are only ordered by cursor within a range.
 
         Args:
             last_cursor: The starting cursor value for the incremental query.
 
         Yields:
-            A pandas DataFrame for each chunk of data fetched from the database.
+            A tuple with the chunk index, a PyArrow Table for each chunk of data
+            fetched from the database and the cursor value of its last row.
         """
-        query = self._build_incremental_query()
-
         logger.info(
-            f"Starting to extract chunks from table: '{self.table_name}' using column: '{self.cursor_column}' as cursor"
+            "Starting to extract chunks from table: '%s' using column: '%s' as cursor",
+            self.table_name,
+            self.cursor_column,
         )
-        with self.engine.connect() as conn:
-            try:
-                chunk_iterator = pd.read_sql(
-                    sql=query,
-                    con=conn,
-                    params=(last_cursor,),
-                    chunksize=self.chunk_size,
-                )
-
-                for i, chunk in enumerate(chunk_iterator, 1):
-                    if not chunk.empty:
-                        try:
-                            logger.info(f"Extracted chunk {i} with {len(chunk)} rows.")
-                            yield i, chunk
-                        except Exception:
-                            logger.error("Error parsing iterator")
-                            raise
-
-            except Exception:
-                logger.error("Error reading SQL Query")
-                raise
-
-            logger.info("Finished extracting all chunks from database.")
+        try:
+            queries = self._build_partitioned_queries(last_cursor)
+            if len(queries) > 1:
+                logger.info("Reading %d cursor ranges in parallel.", len(queries))
+
+            batch_reader = cx.read_sql(
+                self.connection_url,
+                queries,
+                return_type="arrow_stream",
+                protocol="binary",
+                batch_size=self.chunk_size,
+            )
+
+            for i, batch in enumerate(batch_reader, 1):
+                if batch.num_rows:
+                    try:
+                        chunk = pa.Table.from_batches([batch])
+                        tail_cursor = self._get_tail_cursor(batch)
+                        logger.info(
+                            "Extracted chunk %d with %d rows.", i, chunk.num_rows
+                        )
+                        yield i, chunk, tail_cursor
+                    except Exception:
+                        logger.error("Error parsing iterator")
+                        raise
+
+        except Exception:
+            logger.error("Error reading SQL Query")
+            raise
+
+        logger.info("Finished extracting all chunks from database.")
@@ -1,19 +1,28 @@
-import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
-import io
 from datetime import datetime, timezone
 from google.cloud import storage
 
 from utils.logger import get_logger
 from config import env
 
-logger = get_logger()
+logger = get_logger(__name__)
+
+# Resumable upload chunk size, must be a multiple of 256 KiB. Chunks smaller
+# than this in memory are uploaded in a single request
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+ROW_GROUP_SIZE = 1 << 16
+
+# Parquet write batches are sized so a batch of rows stays around 256 KiB,
+# with variable width columns estimated at 32 bytes per value
+WRITE_BATCH_BYTES = 256 * 1024
+MIN_WRITE_BATCH_SIZE = 8192
+VARIABLE_WIDTH_BYTES = 32
 
 
 class GCSParquetLoader:
     """
-    Loads DataFrames to GCS as Parquet files using the explicit
+    Loads PyArrow Tables to GCS as Parquet files using the explicit
     google-cloud-storage API.
     """
 
@@ -32,62 +41,118 @@ class GCSParquetLoader:
         self.pyarrow_schema = pyarrow_schema
         self.table_name = table_name
         self.bucket_name = env.GCS_BUCKET_NAME
+        self.bucket = storage_client.bucket(self.bucket_name)
         self.execution_ts = env.EXECUTION_TS
+        self.write_batch_size = self._get_write_batch_size()
+
+        # Partition Logic: the prefix only depends on the execution timestamp,
+        # so it is rendered once with a single strftime call
+        ts = self._get_partition_ts()
+        escaped_table_name = self.table_name.replace("%", "%%")
+        self.path_prefix = ts.strftime(
+            f"mssql/tables/{escaped_table_name}/ingestion/"
+            "year=%Y/month=%m/day=%d/hour=%H/%Y%m%d%H%M%S"
+        )
 
-    def load_chunk(self, df: pd.DataFrame, chunk_index: int):
+    def _get_partition_ts(self) -> datetime:
         """
-        Loads a DataFrame chunk to GCS as a Parquet file.
+        Resolves the timestamp used to partition the files of this run.
+
+        Returns:
+            The execution timestamp in UTC, or the current time if it is missing or invalid.
+        """
+        ts: datetime
+        if self.execution_ts:
+            try:
+                ts = datetime.fromisoformat(self.execution_ts)
+                logger.info("Using Airflow timestamp: %s", self.execution_ts)
+            except (ValueError, TypeError):
+                logger.error(
+                    "Invalid timestamp received: %s. Using 'Now'.", self.execution_ts
+                )
+                ts = datetime.now(timezone.utc)
+        else:
+            ts = datetime.now(timezone.utc)
+            logger.warning("Execution timestamp not entered, Using 'Now'.")
+
+        if ts.tzinfo is None:
+            ts = ts.astimezone(timezone.utc)
+
+        return ts
+
+    def _get_write_batch_size(self) -> int:
+        """
+        Estimates the Parquet write batch size from the width of the schema.
+
+        Returns:
+            The number of rows per write batch, at least MIN_WRITE_BATCH_SIZE.
+        """
+        row_bytes = 0
+        for field in self.pyarrow_schema:
+            try:
+                row_bytes += max(1, field.type.bit_width // 8)
+            except ValueError:
+                row_bytes += VARIABLE_WIDTH_BYTES
+
+        return max(MIN_WRITE_BATCH_SIZE, WRITE_BATCH_BYTES // max(1, row_bytes))
+
+    def load_chunk(self, table: pa.Table, chunk_index: int):
+        """
+        Loads a Table chunk to GCS as a Parquet file.
 
         Args:
-            df: The DataFrame chunk to load.
+            table: The Table chunk to load.
             chunk_index: The index of the chunk, used for naming the output file.
         """
         try:
-            df = df.filter(items=self.pyarrow_schema.names)
-            table = pa.Table.from_pandas(
-                df, schema=self.pyarrow_schema, preserve_index=False, safe=True
-            )
+            # Columns already match the schema 1:1, projected in the extractor SQL,
+            # and the Transformer enforces the types, so the cast only runs if a
+            # type still differs, and safely so a mismatch raises instead of
+            # writing corrupted values
+            if not table.schema.equals(self.pyarrow_schema):
+                table = table.cast(self.pyarrow_schema)
 
-            # Date Logic
-            ts: datetime
-            if self.execution_ts:
-                try:
-                    ts = datetime.fromisoformat(self.execution_ts)
-                    logger.info(f"Using Airflow timestamp: {self.execution_ts}")
-                except (ValueError, TypeError):
-                    logger.error(
-                        f"Invalid timestamp received: {self.execution_ts}. Using 'Now'."
-                    )
-                    ts = datetime.now(timezone.utc)
-            else:
-                ts = datetime.now(timezone.utc)
-                logger.warning("Execution timestamp not entered, Using 'Now'.")
-
-            if ts.tzinfo is None:
-                ts = ts.astimezone(timezone.utc)
-
-            # Partition Logic
-            gcs_path = (
-                f"mssql/tables/{self.table_name}/ingestion/"
-                f"year={ts.year:04d}/"
-                f"month={ts.month:02d}/"
-                f"day={ts.day:02d}/"
-                f"hour={ts.hour:02d}/"
-                f"{ts.strftime('%Y%m%d%H%M%S')}_{chunk_index}.parquet"
-            )
-            bucket = self.storage_client.bucket(self.bucket_name)
-            blob = bucket.blob(gcs_path)
+            gcs_path = f"{self.path_prefix}_{chunk_index}.parquet"
+            blob = self.bucket.blob(gcs_path)
 
-            # Write Logic
-            buffer = io.BytesIO()
-            pq.write_table(table, buffer, compression="snappy")
-            buffer.seek(0)
-            blob.upload_from_file(buffer, content_type="application/parquet")
+            # Write Logic: small chunks are encoded in memory and sent in a single
+            # multipart request, skipping the resumable session round-trip
+            if table.nbytes < UPLOAD_CHUNK_SIZE:
+                sink = pa.BufferOutputStream()
+                pq.write_table(
+                    table,
+                    sink,
+                    compression="snappy",
+                    row_group_size=ROW_GROUP_SIZE,
+                    write_batch_size=self.write_batch_size,
+                )
+                blob.upload_from_string(
+                    sink.getvalue().to_pybytes(), content_type="application/parquet"
+                )
+
+            # Larger chunks stream row groups into a resumable upload so Parquet
+            # encoding overlaps with the network transfer
+            else:
+                with blob.open(
+                    "wb",
+                    chunk_size=UPLOAD_CHUNK_SIZE,
+                    content_type="application/parquet",
+                ) as fh:
+                    with pq.ParquetWriter(
+                        fh,
+                        table.schema,
+                        compression="snappy",
+                        write_batch_size=self.write_batch_size,
+                    ) as writer:
+                        writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
 
             logger.info(
-                f"Chunk {chunk_index} successfully loaded to: gs://{self.bucket_name}/{gcs_path}"
+                "Chunk %d successfully loaded to: gs://%s/%s",
+                chunk_index,
+                self.bucket_name,
+                gcs_path,
             )
 
         except Exception as e:
-            logger.error(f"Failed to load chunk {chunk_index} to GCS. Error: {e}")
+            logger.error("Failed to load chunk %d to GCS. Error: %s", chunk_index, e)
             raise
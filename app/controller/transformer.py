@@ -1,12 +1,14 @@
-import pandas as pd
+import base64
+import os
 import pyarrow as pa
-from decimal import Decimal
+import pyarrow.compute as pc
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from utils.logger import get_logger
 from config import env
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 SENSITIVE_COLUMNS = {
     "nr_cpf",
@@ -15,70 +17,153 @@ SENSITIVE_COLUMNS = {
     "nm_email_completo",
 }
 
+AESGCM_NONCE_SIZE = 12
+
+# Built once per process, shared by every Transformer instance
+_FERNET = Fernet(env.SECRET_FERNET_KEY)
+_AESGCM = AESGCM(env.SECRET_AES_KEY) if env.SECRET_AES_KEY else None
+
+
+def _encrypt_fernet(values: list[str | None]) -> list[str | None]:
+    """
+    Encrypts values with Fernet (AES-128-CBC + HMAC-SHA256).
+
+    Args:
+        values: The values to encrypt, None values are kept as None.
+
+    Returns:
+        The Fernet tokens as strings.
+    """
+    encrypt = _FERNET.encrypt
+    return [encrypt(x.encode()).decode() if x is not None else None for x in values]
+
+
+def _encrypt_aesgcm(values: list[str | None]) -> list[str | None]:
+    """
+    Encrypts values with AES-256-GCM.
+
+    Each token is the URL-safe base64 encoding of nonce || ciphertext || tag.
+    Nonces are random and sliced from a single os.urandom call per batch.
+    With random 96-bit nonces a key must not encrypt more than about 2^32
+    values, so SECRET_AES_KEY has to be rotated before reaching that volume.
+
+    Args:
+        values: The values to encrypt, None values are kept as None.
+
+    Returns:
+        The AES-GCM tokens as strings.
+    """
+    if _AESGCM is None:
+        raise RuntimeError("SECRET_AES_KEY is required for AES-GCM encryption.")
+
+    encrypt = _AESGCM.encrypt
+    b64encode = base64.urlsafe_b64encode
+    nonces = os.urandom(AESGCM_NONCE_SIZE * len(values))
+
+    encrypted: list[str | None] = []
+    for k, x in enumerate(values):
+        if x is None:
+            encrypted.append(None)
+            continue
+        nonce = nonces[k * AESGCM_NONCE_SIZE : (k + 1) * AESGCM_NONCE_SIZE]
+        encrypted.append(b64encode(nonce + encrypt(nonce, x.encode(), None)).decode())
+    return encrypted
+
 
 class Transformer:
     """
-    Applies basic transformations to a DataFrame chunk.
+    Applies basic transformations to a PyArrow Table chunk.
     """
 
     def __init__(
         self,
         pyarrow_schema: pa.Schema,
-        deleted_columns: set[str] | None = None,
+        deleted_columns: frozenset[str] | None = None,
     ) -> None:
         """
         Initializes the Transformer.
         Args:
             pyarrow_schema: The PyArrow schema to enforce on the data.
-            deleted_columns: List of columns deleted in original database. Defaults to None
+            deleted_columns: Set of columns deleted in original database. Defaults to None
         """
         self.deleted_columns = deleted_columns
         self.pyarrow_schema = pyarrow_schema
-        self.fernet = Fernet(env.SECRET_FERNET_KEY)
+        self.encrypt_values = (
+            _encrypt_aesgcm if env.ENCRYPTION_ALGORITHM == "aesgcm" else _encrypt_fernet
+        )
 
-    def transform_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Columns handled on every chunk, resolved once against the schema as
+        # (index, field) pairs so transform_chunk does not rescan it per chunk
+        self.deleted_fields = [
+            (i, field)
+            for i, field in enumerate(pyarrow_schema)
+            if deleted_columns and field.name in deleted_columns
+        ]
+        self.timestamp_fields = [
+            (i, field.name)
+            for i, field in enumerate(pyarrow_schema)
+            if pa.types.is_timestamp(field.type)
+        ]
+        self.sensitive_fields = [
+            (i, field.name)
+            for i, field in enumerate(pyarrow_schema)
+            if field.name in SENSITIVE_COLUMNS
+        ]
+
+        # Target schema for the single cast applied to every chunk, with
+        # timestamps normalized to millisecond precision
+        self.target_schema = pa.schema(
+            [
+                field.with_type(pa.timestamp("ms"))
+                if pa.types.is_timestamp(field.type)
+                else field
+                for field in pyarrow_schema
+            ]
+        )
+
+    def transform_chunk(self, table: pa.Table) -> pa.Table:
         """
-        Applies all necessary basic transformations to the DataFrame.
+        Applies all necessary basic transformations to the Table.
+
+        PyArrow Tables are immutable, so each transformed column is swapped in
+        with `set_column`, which shares the buffers of every untouched column
+        instead of copying the whole chunk.
 
         Args:
-            df: The DataFrame chunk to be transformed.
+            table: The Table chunk to be transformed.
         """
         try:
-            df = df.copy()
-
-            # Transform deleted columns
-            if self.deleted_columns:
-                for col in self.deleted_columns:
-                    df[col] = None
-
-            for field in self.pyarrow_schema:
-                # Transform timestamp columns to millisecond precision safely
-                if pa.types.is_timestamp(field.type) and field.name in df.columns:
-                    df[field.name] = pd.to_datetime(
-                        df[field.name], errors="coerce"
-                    ).astype("datetime64[ms]")
-
-                # Transform float to high precision decimal
-                elif pa.types.is_decimal(field.type) and field.name in df.columns:
-                    # Use map for element-wise conversion to satisfy type checkers and avoid overload issues
-                    df[field.name] = df[field.name].map(
-                        lambda x: Decimal(str(x)) if pd.notna(x) else None
-                    )
+            # Transform deleted columns, inserted at their schema position so the
+            # chunk lines up 1:1 with the schema
+            for i, field in self.deleted_fields:
+                table = table.add_column(
+                    i, field.name, pa.nulls(table.num_rows, type=field.type)
+                )
+
+            # Transform timestamps to millisecond precision, unsafe casting only
+            # allows the intended sub-millisecond truncation on these columns
+            for i, column in self.timestamp_fields:
+                table = table.set_column(
+                    i,
+                    column,
+                    pc.cast(table.column(i), pa.timestamp("ms"), safe=False),
+                )
+
+            # Transform floats to high precision decimals and enforce the other
+            # types in a single safe cast, so overflow or data loss raises
+            table = table.cast(self.target_schema)
 
             # Encrypt sensitive columns
-            for column in df.columns:
-                if column in SENSITIVE_COLUMNS:
-                    df[column] = df[column].map(
-                        lambda x: (
-                            self.fernet.encrypt(str(x).encode()).decode()
-                            if pd.notna(x)
-                            else None
-                        )
-                    )
+            for i, column in self.sensitive_fields:
+                values = pc.cast(table.column(i), pa.string()).to_pylist()
+                encrypted = self.encrypt_values(values)
+                table = table.set_column(
+                    i, column, pa.array(encrypted, type=pa.string())
+                )
 
             logger.info("Chunk data transformed successfully")
-            return df
+            return table
 
         except Exception as e:
-            logger.error(f"Failed to transform chunk based on data types. Error: {e}")
+            logger.error("Failed to transform chunk based on data types. Error: %s", e)
             raise
@@ -1,17 +1,22 @@
-from sqlalchemy import create_engine, Engine, URL, NullPool
+import functools
+from sqlalchemy import create_engine, Engine, URL
 
 from config import env
 from utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def get_db_engine() -> Engine:
     """
     Creates and returns a SQLAlchemy Engine instance for SQL Server.
 
     Uses the "mssql+pyodbc" dialect and reads connection details from
-    environment variables via the config module.
+    environment variables via the config module. The engine is built once
+    per process and reused by later calls, keeping a single pooled connection
+    so the ODBC handshake is paid only once. The connection is pinged before
+    each checkout, since it can sit idle while ConnectorX extracts a table.
 
     Returns:
     An authenticated SQLAlchemy Engine instance connected to SQL Server.
@@ -34,10 +39,39 @@ def get_db_engine() -> Engine:
             },
         )
 
-        engine = create_engine(connection_url, poolclass=NullPool)
+        engine = create_engine(
+            connection_url, pool_size=1, max_overflow=0, pool_pre_ping=True
+        )
         logger.info("Database engine created successfully.")
         return engine
 
     except Exception as e:
-        logger.error(f"Failed to create database engine. Error: {e}")
+        logger.error("Failed to create database engine. Error: %s", e)
         raise
+
+
+@functools.lru_cache(maxsize=1)
+def get_connectorx_url() -> str:
+    """
+    Builds the SQL Server connection URL used by ConnectorX.
+
+    ConnectorX talks to SQL Server natively over TDS, so the URL uses the
+    plain "mssql" scheme instead of the pyodbc dialect. Credentials are
+    URL-encoded by SQLAlchemy when the URL is rendered.
+
+    Returns:
+        The SQL Server connection URL as a string, including the password.
+    """
+    connection_url = URL.create(
+        "mssql",
+        username=env.DB_USER,
+        password=env.DB_PASSWORD,
+        host=env.DB_HOST,
+        port=env.DB_PORT,
+        database=env.DB_NAME,
+        query={
+            "encrypt": "true",
+            "trust_server_certificate": "true",
+        },
+    )
+    return connection_url.render_as_string(hide_password=False)
@@ -1,3 +1,4 @@
+import functools
 import logging
 from google.cloud import storage
 from google.auth import exceptions
@@ -7,12 +8,14 @@ from config import env
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def get_storage_client() -> storage.Client:
     """
     Creates and returns a Google Cloud Storage client instance.
 
     It relies on Application Default Credentials (ADC) for authentication,
-    which is the standard way to authenticate in GCP environments.
+    which is the standard way to authenticate in GCP environments. The client
+    is built once per process, so credential discovery only happens once.
 
     Returns:
         An authenticated GCS storage.Client instance.
@@ -1,24 +1,157 @@
 import sys
+import pyarrow as pa
+from google.cloud import storage
+from sqlalchemy import Engine
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 
-from config.manifest import get_manifest_json
+from config.manifest import TaskConfig, get_manifest_json, parse_task_item
 from config import env
 
-from core.db import get_db_engine
+from core.db import get_connectorx_url, get_db_engine
 from core.gcp import get_storage_client
 
 from utils.gcs_metadata import GCSMetadataManager
 from utils.schema import (
     build_pyarrow_schema,
     get_current_db_schema,
+    invalidate_current_db_schema,
     validate_current_schema,
 )
-from utils.logger import get_logger
+from utils.logger import configure_root_logger, get_logger
 
 from controller.loader import GCSParquetLoader
 from controller.transformer import Transformer
 from controller.extractor import SQLServerExtractor
 
-logger = get_logger()
+logger = get_logger(__name__)
+
+
+def transform_and_load(
+    transformer: Transformer,
+    loader: GCSParquetLoader,
+    chunk: pa.Table,
+    chunk_index: int,
+) -> int:
+    """
+    Transforms a chunk and loads it to GCS.
+
+    Runs inside the loader thread pool, so it only touches the chunk it
+    receives.
+
+    Args:
+        transformer: The Transformer instance shared by all chunks.
+        loader: The GCSParquetLoader instance shared by all chunks.
+        chunk: The Table chunk yielded by the extractor.
+        chunk_index: The index of the chunk, used for naming the output file.
+
+    Returns:
+        The number of rows loaded.
+    """
+    transformed_chunk = transformer.transform_chunk(chunk)
+    loader.load_chunk(transformed_chunk, chunk_index)
+    return transformed_chunk.num_rows
+
+
+def process_task(
+    task: TaskConfig, engine: Engine, storage_client: storage.Client
+) -> None:
+    """
+    Runs the incremental extraction and load of a single manifest job.
+
+    Args:
+        task: The settings of the manifest job to process.
+        engine: The SQLAlchemy Engine shared by every job of the task.
+        storage_client: The GCS storage client shared by every job of the task.
+    """
+    schema_name, table_name = task.schema_name, task.table_name
+    logger.info("Processing table %s.%s", schema_name, table_name)
+
+    # Fetch schemas
+    metadata_manager = GCSMetadataManager(storage_client, table_name)
+    reference_schema = metadata_manager.get_reference_schema()
+    current_schema = get_current_db_schema(engine, schema_name, table_name)
+
+    # Save reference schema if not exists
+    if reference_schema is None:
+        metadata_manager.save_reference_schema(current_schema)
+        reference_schema = current_schema
+
+    # Validate schema for Schema Drift detection
+    schema_drift_info = validate_current_schema(reference_schema, current_schema)
+    if schema_drift_info.new_columns or schema_drift_info.deleted_columns:
+        invalidate_current_db_schema(schema_name, table_name)
+
+    # Build pyarrow schema
+    pyarrow_schema = build_pyarrow_schema(reference_schema)
+
+    # Select columns in reference schema order so chunks match it 1:1
+    columns_to_select = set(schema_drift_info.columns_to_select)
+    ordered_columns = [c for c in pyarrow_schema.names if c in columns_to_select]
+
+    # I/O process
+    extractor = SQLServerExtractor(
+        connection_url=get_connectorx_url(),
+        columns_to_select=ordered_columns,
+        schema_name=schema_name,
+        table_name=table_name,
+        cursor_column=task.cursor_column,
+        chunk_size=task.chunk_size,
+        num_partitions=task.num_partitions,
+    )
+    transformer = Transformer(pyarrow_schema, schema_drift_info.deleted_columns)
+    loader = GCSParquetLoader(storage_client, pyarrow_schema, table_name)
+
+    # Iterate in chunks
+    last_cursor = metadata_manager.get_last_cursor_value()
+    max_cursor_in_run = None
+    total_rows = 0
+    chunk_count = 0
+
+    # Transform and load in a bounded pool: at most LOADER_MAX_WORKERS
+    # chunks are in flight while the extractor fetches the next one
+    results = []
+    tail_cursors = []
+    with ThreadPoolExecutor(max_workers=env.LOADER_MAX_WORKERS) as pool:
+        pending = set()
+        for i, chunk, tail_cursor in extractor.extract_chunks(last_cursor):
+            tail_cursors.append(tail_cursor)
+
+            if len(pending) >= env.LOADER_MAX_WORKERS:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                # Surfaces failed uploads before extracting any further
+                results.extend(future.result() for future in done)
+
+            pending.add(
+                pool.submit(
+                    transform_and_load,
+                    transformer,
+                    loader,
+                    chunk,
+                    i,
+                )
+            )
+
+        results.extend(future.result() for future in as_completed(pending))
+
+    # Updates cursor once every chunk is loaded: partitioned reads interleave
+    # cursor ranges, so the run's cursor is the max over the chunk tails
+    if results:
+        chunk_count = len(results)
+        total_rows = sum(results)
+        max_cursor_in_run = max(tail_cursors)
+
+    logger.info(
+        "Extraction-load loop finished. Processed %d rows in %d chunks.",
+        total_rows,
+        chunk_count,
+    )
+
+    # Saves cursor if cursor is altered in data batch
+    if max_cursor_in_run is not None:
+        cursor_to_save = max_cursor_in_run.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        metadata_manager.update_cursor_value(str(cursor_to_save))
+    else:
+        logger.info("No new data was processed in this run.")
 
 
 def main():
@@ -31,95 +164,38 @@ def main():
 
     The main workflow is as follows:
     1. Initialize connections to the database (SQL Server) and GCS.
-    2. Manage schema: Fetches the current schema from the database and
-       compares it with a saved reference schema in GCS to handle drift.
-    3. Extract data in chunks using a cursor for incremental loads.
-    4. Transforms data using basic business rules.
-    5. Load each chunk into GCS as a Parquet file.
-    6. Update the cursor value in GCS upon successful completion.
+    2. Select the manifest jobs of this task: TASK_STRIDE contiguous jobs
+       starting at CLOUD_RUN_TASK_INDEX * TASK_STRIDE, sharing the connections.
+    3. For each job, process_task:
+       a. Manage schema: Fetches the current schema from the database and
+          compares it with a saved reference schema in GCS to handle drift.
+       b. Extract data in chunks using a cursor for incremental loads.
+       c. Transforms data using basic business rules.
+       d. Load each chunk into GCS as a Parquet file, using a bounded thread
+          pool so uploads overlap with the extraction of the next chunks.
+       e. Update the cursor value in GCS upon successful completion.
     """
+    configure_root_logger()
     logger.info("ETL application starting...")
 
-    max_cursor_in_run = None
-    total_rows = 0
-    chunk_count = 0
-
     try:
-        # Initialization of instances
+        # Initialization of instances, shared by every job of this task
         engine = get_db_engine()
         storage_client = get_storage_client()
 
-        # List jobs for Cloud Run
+        # List jobs for Cloud Run, each task processes TASK_STRIDE contiguous jobs
         job_list = get_manifest_json(storage_client)
-        if not (0 <= env.CLOUD_RUN_TASK_INDEX < len(job_list)):
+        first_job = env.CLOUD_RUN_TASK_INDEX * env.TASK_STRIDE
+        if not (0 <= first_job < len(job_list)):
             logger.error(
-                f"Task index {env.CLOUD_RUN_TASK_INDEX} is out of bounds for manifest with {len(job_list)} items."
+                "Task index %d is out of bounds for manifest with %d items.",
+                env.CLOUD_RUN_TASK_INDEX,
+                len(job_list),
             )
             sys.exit(1)
 
-        task_item = job_list[env.CLOUD_RUN_TASK_INDEX]
-        schema_name = str(task_item.get("schema_name"))
-        table_name = str(task_item.get("table_name"))
-        cursor_column = str(task_item.get("cursor_column"))
-        chunk_size = int(task_item.get("chunk_size", 1_000_000))
-
-        # Fetch schemas
-        metadata_manager = GCSMetadataManager(storage_client, table_name)
-        reference_schema = metadata_manager.get_reference_schema()
-        current_schema = get_current_db_schema(engine, schema_name, table_name)
-
-        # Save reference schema if not exists
-        if reference_schema is None:
-            metadata_manager.save_reference_schema(current_schema)
-            reference_schema = current_schema
-
-        # Validate schema for Schema Drift detection
-        schema_drift_info = validate_current_schema(reference_schema, current_schema)
-
-        # Build pyarrow schema
-        pyarrow_schema = build_pyarrow_schema(reference_schema)
-
-        # I/O process
-        extractor = SQLServerExtractor(
-            engine=engine,
-            columns_to_select=schema_drift_info.columns_to_select,
-            schema_name=schema_name,
-            table_name=table_name,
-            cursor_column=cursor_column,
-            chunk_size=chunk_size,
-        )
-        transformer = Transformer(pyarrow_schema, schema_drift_info.deleted_columns)
-        loader = GCSParquetLoader(storage_client, pyarrow_schema, table_name)
-
-        # Iterate in chunks
-        last_cursor = metadata_manager.get_last_cursor_value()
-        max_cursor_in_run = None
-        total_rows = 0
-        chunk_count = 0
-
-        for i, chunk in extractor.extract_chunks(last_cursor):
-            transformed_chunk = transformer.transform_chunk(chunk)
-            loader.load_chunk(transformed_chunk, i)
-
-            # Increment chunk counter by 1 per processed chunk
-            chunk_count += 1
-            total_rows += len(transformed_chunk)
-            current_max = transformed_chunk[cursor_column].max()
-
-            # Updates cursor
-            if max_cursor_in_run is None or current_max > max_cursor_in_run:
-                max_cursor_in_run = current_max
-
-        logger.info(
-            f"Extraction-load loop finished. Processed {total_rows} rows in {chunk_count} chunks."
-        )
-
-        # Saves cursor if cursor is altered in data batch
-        if max_cursor_in_run is not None:
-            cursor_to_save = max_cursor_in_run.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-            metadata_manager.update_cursor_value(str(cursor_to_save))
-        else:
-            logger.info("No new data was processed in this run.")
+        for task_item in job_list[first_job : first_job + env.TASK_STRIDE]:
+            process_task(parse_task_item(task_item), engine, storage_client)
 
         logger.info("ETL application finished successfully.")
 
@@ -1,10 +1,11 @@
 from google.cloud import storage
-import json
+from concurrent.futures import Future, ThreadPoolExecutor
+import orjson
 
 from utils.logger import get_logger
 from config import env
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 
 class GCSMetadataManager:
@@ -27,6 +28,11 @@ class GCSMetadataManager:
         self.storage_client = storage_client
         self.table_name = table_name
         self.bucket_name = env.GCS_BUCKET_NAME
+        self.bucket = storage_client.bucket(self.bucket_name)
+
+        # In-memory copies of the state files, set after the first fetch/save
+        self._reference_schema_cache: dict[str, str] | None = None
+        self._cursor_value_cache: str | None = None
 
         # Derive file paths from the table name
         cursor_file_path = (
@@ -40,6 +46,17 @@ class GCSMetadataManager:
         self.cursor_blob = self._get_gcs_blob(cursor_file_path)
         self.schema_blob = self._get_gcs_blob(schema_file_path)
 
+        # Both state files are fetched concurrently, so their round-trips overlap
+        # with each other and with the work done before they are read
+        executor = ThreadPoolExecutor(max_workers=2)
+        self._cursor_future: Future[bytes] | None = executor.submit(
+            self.cursor_blob.download_as_bytes
+        )
+        self._schema_future: Future[bytes] | None = executor.submit(
+            self.schema_blob.download_as_bytes
+        )
+        executor.shutdown(wait=False)
+
     def _get_gcs_blob(self, file_path: str) -> storage.Blob:
         """
         Internal helper to get a GCS blob object.
@@ -50,8 +67,26 @@ class GCSMetadataManager:
         Returns:
             A GCS Blob object.
         """
-        bucket = self.storage_client.bucket(self.bucket_name)
-        return bucket.blob(file_path)
+        return self.bucket.blob(file_path)
+
+    @staticmethod
+    def _download_bytes(future: Future[bytes] | None, blob: storage.Blob) -> bytes:
+        """
+        Internal helper to get the content of a prefetched GCS blob.
+
+        Args:
+            future: The prefetch of the blob, or None if it was already consumed.
+            blob: The GCS blob, downloaded again if there is no prefetch.
+
+        Returns:
+            The blob content as bytes.
+
+        Raises:
+            Exception: If the download fails, e.g. the blob does not exist.
+        """
+        if future is not None:
+            return future.result()
+        return blob.download_as_bytes()
 
     def get_last_cursor_value(self) -> str:
         """
@@ -64,27 +99,37 @@ class GCSMetadataManager:
             The last cursor value as a string.
         """
         try:
-            last_cursor = self.cursor_blob.download_as_string().decode("utf-8")
-            logger.info(f"Found last cursor value: {last_cursor}")
-            return last_cursor
+            future, self._cursor_future = self._cursor_future, None
+            raw_cursor = self._download_bytes(future, self.cursor_blob)
         except Exception:
             logger.warning("Cursor file not found. Assuming initial load.")
             return "1900-01-01 00:00:00.000"
 
+        # Cursors are ASCII timestamps, anything else fails instead of reloading
+        last_cursor = raw_cursor.decode("ascii")
+        logger.info("Found last cursor value: %s", last_cursor)
+        self._cursor_value_cache = last_cursor
+        return last_cursor
+
     def get_reference_schema(self) -> dict[str, str] | None:
         """
         Loads the reference schema from its JSON file in GCS.
 
         If the file does not exist, it returns None, signaling that a new
-        reference schema should be created.
+        reference schema should be created. Once fetched or saved, the schema
+        is served from memory without another GCS request.
 
         Returns:
             A dictionary representing the table schema, or None if not found.
         """
+        if self._reference_schema_cache is not None:
+            return self._reference_schema_cache
+
         try:
-            schema_json = self.schema_blob.download_as_string().decode("utf-8")
-            schema = json.loads(schema_json)
-            logger.info(f"Reference schema loaded with {len(schema)} columns.")
+            future, self._schema_future = self._schema_future, None
+            schema = orjson.loads(self._download_bytes(future, self.schema_blob))
+            logger.info("Reference schema loaded with %d columns.", len(schema))
+            self._reference_schema_cache = schema
             return schema
         except Exception:
             logger.warning("No reference schema found. A new one should be created.")
@@ -94,21 +139,38 @@ class GCSMetadataManager:
         """
         Saves the provided schema as the new reference schema in GCS.
 
+        The upload is skipped if the schema equals the one already held in memory.
+        Otherwise it only succeeds if the file is still at the generation read
+        by this manager, or still missing, so a concurrent task cannot be
+        silently overwritten.
+
         Args:
             schema: The schema dictionary to save as a JSON file.
         """
-        schema_json = json.dumps(schema, indent=4)
+        if schema == self._reference_schema_cache:
+            logger.info("Reference schema unchanged. Skipping upload.")
+            return
+
+        schema_json = orjson.dumps(schema)
         self.schema_blob.upload_from_string(
-            schema_json, content_type="application/json"
+            schema_json,
+            content_type="application/json",
+            if_generation_match=self.schema_blob.generation or 0,
         )
+        self._reference_schema_cache = dict(schema)
         logger.info(
-            f"Reference schema saved to: gs://{self.bucket_name}/{self.schema_blob.name}"
+            "Reference schema saved to: gs://%s/%s",
+            self.bucket_name,
+            self.schema_blob.name,
         )
 
     def update_cursor_value(self, new_cursor_value: str):
         """
         Updates the cursor file in GCS with the new latest value.
 
+        The upload is skipped if the value equals the last cursor read or saved,
+        and is conditioned on the generation read, like the reference schema.
+
         Args:
             new_cursor_value: The new cursor value to save.
         """
@@ -116,5 +178,13 @@ class GCSMetadataManager:
             logger.warning("No new cursor value provided to update. Skipping.")
             return
 
-        self.cursor_blob.upload_from_string(str(new_cursor_value))
-        logger.info(f"Cursor file updated with new value: {new_cursor_value}")
+        new_cursor_value = str(new_cursor_value)
+        if new_cursor_value == self._cursor_value_cache:
+            logger.info("Cursor value unchanged. Skipping upload.")
+            return
+
+        self.cursor_blob.upload_from_string(
+            new_cursor_value, if_generation_match=self.cursor_blob.generation or 0
+        )
+        self._cursor_value_cache = new_cursor_value
+        logger.info("Cursor file updated with new value: %s", new_cursor_value)
@@ -2,25 +2,34 @@ import logging
 import sys
 
 
-def get_logger(name: str = __name__) -> logging.Logger:
+def configure_root_logger() -> None:
     """
-    Initializes and returns a logger instance.
+    Configures the root logger once with the application handler and format.
 
-    Args:
-        name: The name of the logger.
-
-    Returns:
-        A logger instance.
+    Module loggers propagate to the root logger, so a single handler and
+    formatter serve every module.
     """
-    logger = logging.getLogger(name)
+    root_logger = logging.getLogger()
 
-    if not logger.handlers:
+    if not root_logger.handlers:
         handler = logging.StreamHandler(sys.stdout)
         formatter = logging.Formatter(
             "[%(asctime)s] %(module)s %(levelname)s: %(message)s"
         )
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
+        root_logger.addHandler(handler)
+        root_logger.setLevel(logging.INFO)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns a logger instance, without configuring any handler.
+
+    Args:
+        name: The name of the logger, the caller's `__name__` so each module
+            gets its own logger.
 
-    return logger
+    Returns:
+        A logger instance.
+    """
+    return logging.getLogger(name)
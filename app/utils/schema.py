@@ -1,25 +1,75 @@
+import functools
+import re
+from cachetools import TTLCache, cached
 from sqlalchemy import Engine, inspect
 import pyarrow as pa
 from dataclasses import dataclass
 
 from utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
-
-@dataclass
-class SchemaDriftInfo:
-    """Data container for schema drift information."""
-
-    new_columns: set[str]
-    deleted_columns: set[str]
-    columns_to_select: list[str]
+# Inspected table schemas by (schema name, table name), kept for 5 minutes so
+# tasks processing several jobs do not query the catalog again for each table
+_DB_SCHEMA_CACHE: TTLCache = TTLCache(maxsize=128, ttl=300)
 
 
+@dataclass(frozen=True)
+class SchemaDriftInfo:
+    """Immutable, hashable data container for schema drift information."""
+
+    new_columns: frozenset[str]
+    deleted_columns: frozenset[str]
+    columns_to_select: tuple[str, ...]
+
+
+# SQL Server base type names, looked up by the leading token of the type string
+_SQL_TO_PA: dict[str, pa.DataType] = {
+    "int": pa.int64(),
+    "integer": pa.int64(),
+    "bigint": pa.int64(),
+    "smallint": pa.int64(),
+    "tinyint": pa.int64(),
+    "decimal": pa.decimal128(38, 9),
+    "numeric": pa.decimal128(38, 9),
+    "money": pa.decimal128(38, 9),
+    "smallmoney": pa.decimal128(38, 9),
+    "float": pa.float64(),
+    "real": pa.float64(),
+    "bit": pa.bool_(),
+    "timestamp": pa.timestamp("ms"),
+    "datetime": pa.timestamp("ms"),
+    "datetime2": pa.timestamp("ms"),
+    "smalldatetime": pa.timestamp("ms"),
+    "datetimeoffset": pa.timestamp("ms"),
+    "char": pa.string(),
+    "nchar": pa.string(),
+    "varchar": pa.string(),
+    "nvarchar": pa.string(),
+    "text": pa.string(),
+    "ntext": pa.string(),
+    "date": pa.date32(),
+}
+
+# Fallback for other type names: patterns in match priority order, e.g. "datetime" must win over "date"
+_DTYPE_PATTERNS: tuple[tuple[re.Pattern[str], pa.DataType], ...] = (
+    (re.compile(r"int"), pa.int64()),
+    (re.compile(r"decimal|numeric|money"), pa.decimal128(38, 9)),
+    (re.compile(r"float|real"), pa.float64()),
+    (re.compile(r"bit"), pa.bool_()),
+    (re.compile(r"timestamp|datetime"), pa.timestamp("ms")),
+    (re.compile(r"char|text"), pa.string()),
+    (re.compile(r"date"), pa.date32()),
+)
+
+
+@functools.lru_cache(maxsize=256)
 def _map_sql_to_pyarrow_dtype(sql_type: str) -> pa.DataType:
     """
     Maps SQL data types to PyArrow data types.
 
+    Results are cached, since the same SQL type strings repeat across columns.
+
     Args:
         sql_type: SQL data type.
 
@@ -29,27 +79,25 @@ def _map_sql_to_pyarrow_dtype(sql_type: str) -> pa.DataType:
     """
     sql_type_lower = sql_type.lower()
 
-    if any(s in sql_type_lower for s in ["int", "smallint", "tinyint", "bigint"]):
-        return pa.int64()
-    elif any(s in sql_type_lower for s in ["decimal", "numeric", "money"]):
-        return pa.decimal128(38, 9)
-    elif any(s in sql_type_lower for s in ["float", "real"]):
-        return pa.float64()
-    elif "bit" in sql_type_lower:
-        return pa.bool_()
-    elif any(s in sql_type_lower for s in ["timestamp", "datetime"]):
-        return pa.timestamp("ms")
-    elif any(s in sql_type_lower for s in ["char", "text", "varchar", "nvarchar"]):
-        return pa.string()
-    elif "date" in sql_type_lower:
-        return pa.date32()
-    else:  # Fallback for other types
-        logger.warning(
-            f"Unmapped SQL type '{sql_type}' found. Defaulting to pa.string()."
-        )
-        return pa.string()
+    # Base type name without length, precision or collation, e.g. "varchar(50)"
+    token = sql_type_lower.partition("(")[0].strip().partition(" ")[0]
+    dtype = _SQL_TO_PA.get(token)
+    if dtype is not None:
+        return dtype
+
+    for pattern, dtype in _DTYPE_PATTERNS:
+        if pattern.search(sql_type_lower):
+            return dtype
+
+    # Fallback for other types
+    logger.warning("Unmapped SQL type '%s' found. Defaulting to pa.string().", sql_type)
+    return pa.string()
 
 
+@cached(
+    _DB_SCHEMA_CACHE,
+    key=lambda engine, schema_name, table_name: (schema_name, table_name),
+)
 def get_current_db_schema(
     engine: Engine, schema_name: str, table_name: str
 ) -> dict[str, str]:
@@ -57,7 +105,8 @@ def get_current_db_schema(
     Inspects the database and returns the current table schema.
 
     This function uses the provided SQLAlchemy engine and inspector to
-    fetch schema details for a specific table.
+    fetch schema details for a specific table. Results are cached for 5
+    minutes per table, see `invalidate_current_db_schema`.
 
     Args:
         engine: SQLAlchemy Engine instance.
@@ -73,56 +122,90 @@ def get_current_db_schema(
         for col in inspector.get_columns(table_name, schema=schema_name)
     }
     logger.info(
-        f"Fetched current database schema for {schema_name}.{table_name} with {len(columns)} columns."
+        "Fetched current database schema for %s.%s with %d columns.",
+        schema_name,
+        table_name,
+        len(columns),
     )
     return columns
 
 
+def invalidate_current_db_schema(schema_name: str, table_name: str) -> None:
+    """
+    Drops the cached schema of a table, so the next inspection hits the database.
+
+    Args:
+        schema_name: The name of the database schema.
+        table_name: The name of the table.
+    """
+    _DB_SCHEMA_CACHE.pop((schema_name, table_name), None)
+
+
 def validate_current_schema(
     reference: dict[str, str], current: dict[str, str]
 ) -> SchemaDriftInfo:
-    reference_schema_cols = set(reference.keys())
-    current_schema_cols = set(current.keys())
+    # Key views support set operations and O(1) lookups without building sets
+    reference_schema_cols = reference.keys()
+    current_schema_cols = current.keys()
 
     new_cols = current_schema_cols - reference_schema_cols
     if new_cols:
         logger.warning(
-            f"[SCHEMA DRIFT] New columns detected and ignored: '{sorted(list(new_cols))}'"
+            "[SCHEMA DRIFT] New columns detected and ignored: '%s'", sorted(new_cols)
         )
 
     deleted_cols = reference_schema_cols - current_schema_cols
     if deleted_cols:
         logger.warning(
-            f"[SCHEMA DRIFT] Deleted columns detected: '{sorted(list(deleted_cols))}', will be added as null: "
+            "[SCHEMA DRIFT] Deleted columns detected: '%s', will be added as null: ",
+            sorted(deleted_cols),
         )
 
-    cols_to_select = sorted(
-        list(reference_schema_cols.intersection(current_schema_cols))
-    )
+    cols_to_select = tuple(sorted(c for c in reference_schema_cols if c in current))
 
     return SchemaDriftInfo(
-        new_columns=new_cols,
-        deleted_columns=deleted_cols,
+        new_columns=frozenset(new_cols),
+        deleted_columns=frozenset(deleted_cols),
         columns_to_select=cols_to_select,
     )
 
 
-def build_pyarrow_schema(columns: dict[str, str]) -> pa.Schema:
+@functools.lru_cache(maxsize=32)
+def _build_pyarrow_schema_cached(columns: tuple[tuple[str, str], ...]) -> pa.Schema:
     """
-    Builds a PyArrow Schema object from the current database schema.
+    Builds and memoises a PyArrow Schema from (column name, SQL type) pairs.
+
+    PyArrow schemas are immutable, so the cached instance is safe to share.
 
     Args:
-        columns: A dictionary mapping column names to their SQL type.
+        columns: A tuple of (column name, SQL type) pairs, in column order.
 
     Returns:
         A PyArrow Schema object representing the table's structure.
     """
-    pa_schema = pa.schema(
+    return pa.schema(
         [
             (col_name, _map_sql_to_pyarrow_dtype(sql_type))
-            for col_name, sql_type in columns.items()
+            for col_name, sql_type in columns
         ]
     )
 
+
+def build_pyarrow_schema(columns: dict[str, str]) -> pa.Schema:
+    """
+    Builds a PyArrow Schema object from the current database schema.
+
+    The items are passed to the cache in insertion order, so the schema keeps
+    the column order of the dictionary and repeated calls with the same
+    columns reuse the schema built first.
+
+    Args:
+        columns: A dictionary mapping column names to their SQL type.
+
+    Returns:
+        A PyArrow Schema object representing the table's structure.
+    """
+    pa_schema = _build_pyarrow_schema_cached(tuple(columns.items()))
+
     logger.info("Successfully built PyArrow schema for table.")
     return pa_schema
@@ -0,0 +1,42 @@
+import os
+from collections.abc import Callable
+from typing import Any
+
+from cryptography.fernet import Fernet
+
+# config.env validates the required settings at import, so modules that read
+# it get dummy values for the test session, without overriding real ones
+for name in [
+    "DB_USER",
+    "DB_PASSWORD",
+    "DB_HOST",
+    "DB_NAME",
+    "GCP_PROJECT_ID",
+    "GCS_BUCKET_NAME",
+]:
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("DB_PORT", "1433")
+os.environ.setdefault("SECRET_FERNET_KEY", Fernet.generate_key().decode())
+
+
+class FakeBucket:
+    """In-memory stand-in for storage.Bucket, creating blobs with `blob_factory`."""
+
+    def __init__(self, blob_factory: Callable[[str], Any]) -> None:
+        self.blob_factory = blob_factory
+        self.blobs: dict[str, Any] = {}
+
+    def blob(self, name: str) -> Any:
+        if name not in self.blobs:
+            self.blobs[name] = self.blob_factory(name)
+        return self.blobs[name]
+
+
+class FakeClient:
+    """In-memory stand-in for storage.Client, serving a single FakeBucket."""
+
+    def __init__(self, blob_factory: Callable[[str], Any]) -> None:
+        self.fake_bucket = FakeBucket(blob_factory)
+
+    def bucket(self, name: str) -> FakeBucket:
+        return self.fake_bucket
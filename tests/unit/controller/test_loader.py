@@ -0,0 +1,92 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.controller import loader
+from app.controller.loader import GCSParquetLoader
+from tests.conftest import FakeClient
+
+_SCHEMA = pa.schema([("id", pa.int64()), ("nm_cliente", pa.string())])
+_TABLE = pa.table({"id": [1, 2, 3], "nm_cliente": ["a", None, "c"]}, schema=_SCHEMA)
+
+
+class _FakeWriter(io.BytesIO):
+    """Writable file object that keeps its content after being closed."""
+
+    def __init__(self, blob: "_FakeBlob") -> None:
+        super().__init__()
+        self.blob = blob
+
+    def close(self) -> None:
+        if not self.closed:
+            self.blob.data = self.getvalue()
+        super().close()
+
+
+class _FakeBlob:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.data: bytes | None = None
+        self.calls: list[tuple[str, dict]] = []
+
+    def upload_from_string(self, data: bytes, content_type=None) -> None:
+        self.calls.append(("upload_from_string", {"content_type": content_type}))
+        self.data = data
+
+    def open(self, mode: str, **kwargs) -> _FakeWriter:
+        self.calls.append(("open", {"mode": mode, **kwargs}))
+        return _FakeWriter(self)
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> FakeClient:
+    monkeypatch.setattr(loader.env, "EXECUTION_TS", "2025-01-05T10:20:30+00:00")
+    return FakeClient(_FakeBlob)
+
+
+def _loaded_blob(client: FakeClient, chunk_index: int) -> _FakeBlob:
+    path = (
+        "mssql/tables/tb_pedido/ingestion/year=2025/month=01/day=05/hour=10/"
+        f"20250105102030_{chunk_index}.parquet"
+    )
+    assert list(client.fake_bucket.blobs) == [path]
+    return client.fake_bucket.blobs[path]
+
+
+def test_small_chunk_uses_single_request(client: FakeClient):
+    """Chunks below UPLOAD_CHUNK_SIZE are encoded in memory and sent at once."""
+    GCSParquetLoader(client, _SCHEMA, "tb_pedido").load_chunk(_TABLE, 0)
+
+    blob = _loaded_blob(client, 0)
+    assert blob.calls == [
+        ("upload_from_string", {"content_type": "application/parquet"})
+    ]
+    assert pq.read_table(pa.BufferReader(blob.data)).equals(_TABLE)
+
+
+def test_large_chunk_streams_resumable_upload(
+    client: FakeClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Chunks from UPLOAD_CHUNK_SIZE on are streamed through blob.open."""
+    monkeypatch.setattr(loader, "UPLOAD_CHUNK_SIZE", 0)
+
+    GCSParquetLoader(client, _SCHEMA, "tb_pedido").load_chunk(_TABLE, 1)
+
+    blob = _loaded_blob(client, 1)
+    assert blob.calls == [
+        (
+            "open",
+            {"mode": "wb", "chunk_size": 0, "content_type": "application/parquet"},
+        )
+    ]
+    assert pq.read_table(pa.BufferReader(blob.data)).equals(_TABLE)
+
+
+def test_mismatched_chunk_is_cast_safely(client: FakeClient):
+    """Types that still differ are cast, and a lossy cast raises."""
+    chunk = pa.table({"id": [1.0, 2.5], "nm_cliente": ["a", "b"]})
+
+    with pytest.raises(pa.ArrowInvalid):
+        GCSParquetLoader(client, _SCHEMA, "tb_pedido").load_chunk(chunk, 2)
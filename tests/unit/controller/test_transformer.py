@@ -0,0 +1,116 @@
+import base64
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import pyarrow as pa
+import pytest
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from app.controller import transformer
+from app.controller.transformer import AESGCM_NONCE_SIZE, Transformer
+
+
+def _decrypt_fernet(token: str) -> str:
+    return Fernet(transformer.env.SECRET_FERNET_KEY).decrypt(token.encode()).decode()
+
+
+@pytest.fixture
+def aes_key(monkeypatch: pytest.MonkeyPatch) -> bytes:
+    """Enables AES-GCM in the transformer module with a random 256-bit key."""
+    key = os.urandom(32)
+    monkeypatch.setattr(transformer, "_AESGCM", AESGCM(key))
+    return key
+
+
+@pytest.mark.parametrize("algorithm", ["fernet", "aesgcm"])
+def test_encrypt_values_round_trip(algorithm: str, aes_key: bytes):
+    """Encrypted values decrypt back to the original, and None stays None."""
+    values = ["123.456.789-00", None, "user@example.com"]
+
+    if algorithm == "fernet":
+        encrypted = transformer._encrypt_fernet(values)
+        decrypt = _decrypt_fernet
+    else:
+        encrypted = transformer._encrypt_aesgcm(values)
+
+        def decrypt(token: str) -> str:
+            raw = base64.urlsafe_b64decode(token)
+            nonce, ciphertext = raw[:AESGCM_NONCE_SIZE], raw[AESGCM_NONCE_SIZE:]
+            return AESGCM(aes_key).decrypt(nonce, ciphertext, None).decode()
+
+    assert encrypted[1] is None
+    assert encrypted[0] != values[0]
+    assert [decrypt(x) if x is not None else None for x in encrypted] == values
+
+
+def test_encrypt_aesgcm_uses_fresh_nonces(aes_key: bytes):
+    """Equal plaintexts produce different tokens."""
+    first, second = transformer._encrypt_aesgcm(["same", "same"])
+    assert first != second
+
+
+_SCHEMA = pa.schema(
+    [
+        ("id", pa.int64()),
+        ("amount", pa.decimal128(38, 9)),
+        ("gone", pa.string()),
+        ("ts", pa.timestamp("ms")),
+        ("nr_cpf", pa.string()),
+    ]
+)
+
+
+def _chunk(amounts: list[float | None]) -> pa.Table:
+    """Builds a chunk as read from the database, without the deleted column."""
+    n = len(amounts)
+    return pa.table(
+        {
+            "id": pa.array(range(n), pa.int64()),
+            "amount": pa.array(amounts, pa.float64()),
+            "ts": pa.array(
+                [datetime(2025, 1, 1, 1, 1, 1, 123456)] * n, pa.timestamp("ns")
+            ),
+            "nr_cpf": pa.array(["123", None][:n], pa.string()),
+        }
+    )
+
+
+def test_transform_chunk_inserts_deleted_columns_as_nulls():
+    """Deleted columns are added as nulls at their schema position."""
+    result = Transformer(_SCHEMA, frozenset({"gone"})).transform_chunk(
+        _chunk([1.5, None])
+    )
+
+    assert result.column_names == _SCHEMA.names
+    assert result.column("gone").null_count == 2
+    assert result.schema.field("gone").type == pa.string()
+
+
+def test_transform_chunk_casts_decimals_and_timestamps():
+    """Floats become decimal128(38, 9) and timestamps are truncated to ms."""
+    result = Transformer(_SCHEMA, frozenset({"gone"})).transform_chunk(
+        _chunk([1.5, None])
+    )
+
+    assert result.schema == _SCHEMA
+    assert result.column("amount").to_pylist() == [Decimal("1.500000000"), None]
+    assert result.column("ts")[0].as_py() == datetime(2025, 1, 1, 1, 1, 1, 123000)
+
+
+def test_transform_chunk_rejects_decimal_overflow():
+    """Values that do not fit decimal128(38, 9) raise instead of being corrupted."""
+    with pytest.raises(pa.ArrowInvalid):
+        Transformer(_SCHEMA, frozenset({"gone"})).transform_chunk(_chunk([1e30]))
+
+
+def test_transform_chunk_encrypts_sensitive_columns():
+    """Sensitive values are encrypted and nulls stay null."""
+    result = Transformer(_SCHEMA, frozenset({"gone"})).transform_chunk(
+        _chunk([1.5, None])
+    )
+
+    token, missing = result.column("nr_cpf").to_pylist()
+    assert _decrypt_fernet(token) == "123"
+    assert missing is None
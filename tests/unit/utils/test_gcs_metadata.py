@@ -0,0 +1,155 @@
+import orjson
+import pytest
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from app.utils.gcs_metadata import GCSMetadataManager
+from tests.conftest import FakeClient
+
+_TABLE = "tb_pedido"
+_CURSOR_PATH = f"mssql/tables/{_TABLE}/state/{_TABLE}_cursor.txt"
+_SCHEMA_PATH = f"mssql/tables/{_TABLE}/state/{_TABLE}_schema.json"
+
+
+class _FakeBlob:
+    """In-memory stand-in for storage.Blob that enforces generation preconditions."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.data: bytes | None = None
+        self.server_generation = 0
+        self.generation: int | None = None
+        self.downloads = 0
+        self.uploads: list[dict] = []
+
+    def download_as_bytes(self) -> bytes:
+        self.downloads += 1
+        if self.data is None:
+            raise NotFound(self.name)
+        self.generation = self.server_generation
+        return self.data
+
+    def upload_from_string(self, data, content_type=None, if_generation_match=None):
+        if if_generation_match != self.server_generation:
+            raise PreconditionFailed(self.name)
+        self.uploads.append(
+            {"content_type": content_type, "if_generation_match": if_generation_match}
+        )
+        self.data = data.encode() if isinstance(data, str) else data
+        self.server_generation += 1
+        self.generation = self.server_generation
+
+
+def _store(client: FakeClient, path: str, data: bytes, generation: int) -> None:
+    blob = client.fake_bucket.blob(path)
+    blob.data = data
+    blob.server_generation = generation
+
+
+@pytest.fixture
+def client() -> FakeClient:
+    return FakeClient(_FakeBlob)
+
+
+def test_state_files_are_prefetched_once(client: FakeClient):
+    """Both state files are downloaded on init and then served from memory."""
+    _store(client, _SCHEMA_PATH, orjson.dumps({"id": "int"}), generation=3)
+    _store(client, _CURSOR_PATH, b"2025-01-01 00:00:00.000", generation=5)
+    manager = GCSMetadataManager(client, _TABLE)
+
+    assert manager.get_reference_schema() == {"id": "int"}
+    assert manager.get_reference_schema() == {"id": "int"}
+    assert manager.get_last_cursor_value() == "2025-01-01 00:00:00.000"
+
+    assert client.fake_bucket.blob(_SCHEMA_PATH).downloads == 1
+    assert client.fake_bucket.blob(_CURSOR_PATH).downloads == 1
+
+
+def test_missing_state_files_use_defaults(client: FakeClient):
+    manager = GCSMetadataManager(client, _TABLE)
+
+    assert manager.get_reference_schema() is None
+    assert manager.get_last_cursor_value() == "1900-01-01 00:00:00.000"
+
+
+def test_save_reference_schema_creates_missing_file(client: FakeClient):
+    """A missing schema is only created if it is still missing (generation 0)."""
+    manager = GCSMetadataManager(client, _TABLE)
+    assert manager.get_reference_schema() is None
+
+    manager.save_reference_schema({"id": "int"})
+
+    blob = client.fake_bucket.blob(_SCHEMA_PATH)
+    assert blob.uploads == [
+        {"content_type": "application/json", "if_generation_match": 0}
+    ]
+    assert orjson.loads(blob.data) == {"id": "int"}
+    assert manager.get_reference_schema() == {"id": "int"}
+    assert blob.downloads == 1
+
+
+def test_save_reference_schema_skips_unchanged(client: FakeClient):
+    _store(client, _SCHEMA_PATH, orjson.dumps({"id": "int"}), generation=3)
+    manager = GCSMetadataManager(client, _TABLE)
+    manager.get_reference_schema()
+
+    manager.save_reference_schema({"id": "int"})
+
+    assert client.fake_bucket.blob(_SCHEMA_PATH).uploads == []
+
+
+def test_save_reference_schema_matches_read_generation(client: FakeClient):
+    _store(client, _SCHEMA_PATH, orjson.dumps({"id": "int"}), generation=3)
+    manager = GCSMetadataManager(client, _TABLE)
+    manager.get_reference_schema()
+
+    manager.save_reference_schema({"id": "int", "nm_cliente": "varchar"})
+
+    blob = client.fake_bucket.blob(_SCHEMA_PATH)
+    assert blob.uploads[-1]["if_generation_match"] == 3
+    assert orjson.loads(blob.data) == {"id": "int", "nm_cliente": "varchar"}
+
+
+def test_save_reference_schema_fails_on_concurrent_create(client: FakeClient):
+    """A schema created by another task after the read is not overwritten."""
+    manager = GCSMetadataManager(client, _TABLE)
+    assert manager.get_reference_schema() is None
+    _store(client, _SCHEMA_PATH, orjson.dumps({"id": "bigint"}), generation=1)
+
+    with pytest.raises(PreconditionFailed):
+        manager.save_reference_schema({"id": "int"})
+
+    assert orjson.loads(client.fake_bucket.blob(_SCHEMA_PATH).data) == {"id": "bigint"}
+
+
+def test_update_cursor_value_skips_unchanged(client: FakeClient):
+    _store(client, _CURSOR_PATH, b"2025-01-01 00:00:00.000", generation=5)
+    manager = GCSMetadataManager(client, _TABLE)
+    manager.get_last_cursor_value()
+
+    manager.update_cursor_value("2025-01-01 00:00:00.000")
+
+    assert client.fake_bucket.blob(_CURSOR_PATH).uploads == []
+
+
+def test_update_cursor_value_matches_read_generation(client: FakeClient):
+    _store(client, _CURSOR_PATH, b"2025-01-01 00:00:00.000", generation=5)
+    manager = GCSMetadataManager(client, _TABLE)
+    manager.get_last_cursor_value()
+
+    manager.update_cursor_value("2025-01-02 00:00:00.000")
+    # The saved value is cached, so repeating it does not upload again
+    manager.update_cursor_value("2025-01-02 00:00:00.000")
+
+    blob = client.fake_bucket.blob(_CURSOR_PATH)
+    assert blob.uploads == [{"content_type": None, "if_generation_match": 5}]
+    assert blob.data == b"2025-01-02 00:00:00.000"
+
+
+def test_update_cursor_value_creates_missing_file(client: FakeClient):
+    manager = GCSMetadataManager(client, _TABLE)
+    manager.get_last_cursor_value()
+
+    manager.update_cursor_value("2025-01-02 00:00:00.000")
+
+    blob = client.fake_bucket.blob(_CURSOR_PATH)
+    assert blob.uploads == [{"content_type": None, "if_generation_match": 0}]
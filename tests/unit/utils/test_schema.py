@@ -1,131 +1,208 @@
 import pyarrow as pa
-from pytest_mock import MockerFixture
+import pytest
 
 
 from app.utils.schema import (
+    SchemaDriftInfo,
     _map_sql_to_pyarrow_dtype,
     validate_current_schema,
     build_pyarrow_schema,
     get_current_db_schema,
+    invalidate_current_db_schema,
 )
 
 
-def test_map_sql_to_pyarrow_dtype_various_types():
-    """Tests the mapping for common SQL types."""
-    assert _map_sql_to_pyarrow_dtype("INT") == pa.int64()
-    assert _map_sql_to_pyarrow_dtype("bigint") == pa.int64()
-    assert _map_sql_to_pyarrow_dtype("SMALLINT") == pa.int64()
-    assert _map_sql_to_pyarrow_dtype("tinyint") == pa.int64()
-    assert _map_sql_to_pyarrow_dtype("VARCHAR(50)") == pa.string()
-    assert _map_sql_to_pyarrow_dtype("NVARCHAR(MAX)") == pa.string()
-    assert _map_sql_to_pyarrow_dtype("TEXT") == pa.string()
-    assert _map_sql_to_pyarrow_dtype("DECIMAL(18,2)") == pa.decimal128(38, 9)
-    assert _map_sql_to_pyarrow_dtype("numeric") == pa.decimal128(38, 9)
-    assert _map_sql_to_pyarrow_dtype("money") == pa.decimal128(38, 9)
-    assert _map_sql_to_pyarrow_dtype("FLOAT") == pa.float64()
-    assert _map_sql_to_pyarrow_dtype("real") == pa.float64()
-    assert _map_sql_to_pyarrow_dtype("BIT") == pa.bool_()
-    assert _map_sql_to_pyarrow_dtype("timestamp") == pa.timestamp("ms")
-    assert _map_sql_to_pyarrow_dtype("DATETIME2(3)") == pa.timestamp("ms")
-    assert _map_sql_to_pyarrow_dtype("datetime") == pa.timestamp("ms")
-    assert _map_sql_to_pyarrow_dtype("DATE") == pa.date32()
-    assert _map_sql_to_pyarrow_dtype("UUID") == pa.string()
-
-
-def test_map_sql_to_pyarrow_dtype_fallback(mocker):
-    """Tests the fallback to string for unmapped types and logs a warning."""
-    mock_logger_warning = mocker.patch("app.utils.schema.logger.warning")
-    assert _map_sql_to_pyarrow_dtype("XML") == pa.string()
-    assert _map_sql_to_pyarrow_dtype("JSON") == pa.string()
-    assert _map_sql_to_pyarrow_dtype("UUID") == pa.string()
-    assert _map_sql_to_pyarrow_dtype("TEXT") == pa.string()
-    # Check if logger.warning was called
-    assert (
-        mock_logger_warning.call_count >= 1
-    )  # At least one warning expected if not mapped
+def _make_counter():
+    """Returns a stub that accepts any call, and the list holding its call count."""
+    n = [0]
+    return (lambda *a, **k: n.__setitem__(0, n[0] + 1)), n
 
 
-def test_validate_current_schema_basic(mocker: MockerFixture):
-    """Validate detection of new, deleted and intersecting columns and warnings."""
-    mock_warn = mocker.patch("app.utils.schema.logger.warning")
+class _FakeInspector:
+    """Minimal stand-in for a SQLAlchemy Inspector that records its calls."""
 
-    reference = {"id": "INT", "amount": "DECIMAL(18,2)", "ts": "DATETIME2(3)"}
-    current = {"id": "INT", "amount": "DECIMAL(18,2)", "extra": "VARCHAR(10)"}
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
 
-    info = validate_current_schema(reference, current)
-
-    assert info.new_columns == {"extra"}
-    assert info.deleted_columns == {"ts"}
-    assert info.columns_to_select == ["amount", "id"]  # sorted intersection
-
-    # Should warn once for new and once for deleted
-    assert mock_warn.call_count >= 2
-
-
-def test_build_pyarrow_schema_constructs_expected():
-    """Ensure build_pyarrow_schema maps SQL types to expected PyArrow schema."""
-    cols = {
-        "id": "INT",
-        "price": "DECIMAL(18,2)",
-        "flag": "BIT",
-        "event_time": "DATETIME2(3)",
-        "created_date": "DATE",
-        "name": "VARCHAR(50)",
-    }
-
-    schema = build_pyarrow_schema(cols)
-
-    expected = pa.schema(
-        [
-            ("id", pa.int64()),
-            ("price", pa.decimal128(38, 9)),
-            ("flag", pa.bool_()),
-            ("event_time", pa.timestamp("ms")),
-            ("created_date", pa.date32()),
-            ("name", pa.string()),
+    def get_columns(self, table_name: str, schema: str) -> list[dict[str, str]]:
+        self.calls.append((table_name, schema))
+        return [
+            {"name": "id", "type": "INTEGER"},
+            {"name": "amount", "type": "DECIMAL(18,2)"},
         ]
-    )
-
-    assert schema == expected
 
 
-def test_get_current_db_schema_uses_inspector(mocker: MockerFixture):
-    """Mock SQLAlchemy inspect to verify columns are returned as name->type string map."""
-    mock_inspect = mocker.patch("app.utils.schema.inspect")
-    mock_logger_info = mocker.patch("app.utils.schema.logger.info")
-
-    fake_inspector = mocker.MagicMock()
-    fake_inspector.get_columns.return_value = [
-        {"name": "id", "type": "INTEGER"},
-        {"name": "amount", "type": "DECIMAL(18,2)"},
-    ]
-    mock_inspect.return_value = fake_inspector
+@pytest.fixture
+def fake_inspector(monkeypatch: pytest.MonkeyPatch) -> _FakeInspector:
+    """Routes `inspect` in the schema module to a fresh fake inspector."""
+    inspector = _FakeInspector()
+    monkeypatch.setattr("app.utils.schema.inspect", lambda engine: inspector)
+    return inspector
+
+
+# PyArrow types built once at import and shared by every case
+_INT64 = pa.int64()
+_STR = pa.string()
+_DEC = pa.decimal128(38, 9)
+_F64 = pa.float64()
+_BOOL = pa.bool_()
+_TS_MS = pa.timestamp("ms")
+_DATE32 = pa.date32()
+
+
+_CASES = [
+    ("INT", _INT64),
+    ("bigint", _INT64),
+    ("SMALLINT", _INT64),
+    ("tinyint", _INT64),
+    ("VARCHAR(50)", _STR),
+    ("NVARCHAR(MAX)", _STR),
+    ("TEXT", _STR),
+    ("DECIMAL(18,2)", _DEC),
+    ("numeric", _DEC),
+    ("money", _DEC),
+    ("FLOAT", _F64),
+    ("real", _F64),
+    ("BIT", _BOOL),
+    ("timestamp", _TS_MS),
+    ("DATETIME2(3)", _TS_MS),
+    ("datetime", _TS_MS),
+    ("DATE", _DATE32),
+    ("UUID", _STR),
+]
+
+
+@pytest.mark.parametrize("sql,expected", _CASES)
+def test_map_sql_to_pyarrow_dtype_various_types(sql: str, expected: pa.DataType):
+    """Tests the mapping for common SQL types."""
+    assert _map_sql_to_pyarrow_dtype(sql) == expected
 
-    engine = mocker.MagicMock()
-    result = get_current_db_schema(engine, "dbo", "payments")
 
-    assert result == {"id": "INTEGER", "amount": "DECIMAL(18,2)"}
-    fake_inspector.get_columns.assert_called_once_with("payments", schema="dbo")
-    mock_logger_info.assert_called()
+def test_map_sql_to_pyarrow_dtype_fallback(monkeypatch: pytest.MonkeyPatch):
+    """Tests the fallback to string for unmapped types and logs a warning."""
+    warning, n = _make_counter()
+    monkeypatch.setattr("app.utils.schema.logger.warning", warning)
+    _map_sql_to_pyarrow_dtype.cache_clear()  # cached types would not warn again
+    assert _map_sql_to_pyarrow_dtype("XML") == _STR
+    assert _map_sql_to_pyarrow_dtype("JSON") == _STR
+    assert _map_sql_to_pyarrow_dtype("UUID") == _STR
+    assert _map_sql_to_pyarrow_dtype("TEXT") == _STR
+    # Check if logger.warning was called
+    assert n[0] >= 1  # At least one warning expected if not mapped
+
+
+def _drift(info: SchemaDriftInfo) -> tuple:
+    """Returns the new, deleted and selected columns of a drift result."""
+    return (info.new_columns, info.deleted_columns, info.columns_to_select)
+
+
+_DRIFT_CASES = [
+    # New and deleted columns, warns once for each
+    (
+        {"id": "INT", "amount": "DECIMAL(18,2)", "ts": "DATETIME2(3)"},
+        {"id": "INT", "amount": "DECIMAL(18,2)", "extra": "VARCHAR(10)"},
+        {"extra"},
+        {"ts"},
+        ("amount", "id"),  # sorted intersection
+        2,
+    ),
+    # Schemas match exactly, no warnings
+    (
+        {"a": "INT", "b": "VARCHAR(10)", "c": "DATE"},
+        {"a": "INT", "b": "VARCHAR(10)", "c": "DATE"},
+        set(),
+        set(),
+        ("a", "b", "c"),
+        0,
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "reference,current,expected_new,expected_deleted,expected_select,expected_warns",
+    _DRIFT_CASES,
+)
+def test_validate_current_schema(
+    monkeypatch: pytest.MonkeyPatch,
+    reference: dict[str, str],
+    current: dict[str, str],
+    expected_new: set[str],
+    expected_deleted: set[str],
+    expected_select: tuple[str, ...],
+    expected_warns: int,
+):
+    """Validate detection of new, deleted and intersecting columns and warnings."""
+    warning, n = _make_counter()
+    monkeypatch.setattr("app.utils.schema.logger.warning", warning)
 
+    info = validate_current_schema(reference, current)
 
-def test_validate_current_schema_no_drift(mocker: MockerFixture):
-    """When schemas match exactly, no warnings and correct selection order."""
-    mock_warn = mocker.patch("app.utils.schema.logger.warning")
+    assert _drift(info) == (expected_new, expected_deleted, expected_select)
+    assert n[0] == expected_warns
+
+
+_BUILD_CASES = [
+    (
+        {
+            "id": "INT",
+            "price": "DECIMAL(18,2)",
+            "flag": "BIT",
+            "event_time": "DATETIME2(3)",
+            "created_date": "DATE",
+            "name": "VARCHAR(50)",
+        },
+        pa.schema(
+            [
+                ("id", _INT64),
+                ("price", _DEC),
+                ("flag", _BOOL),
+                ("event_time", _TS_MS),
+                ("created_date", _DATE32),
+                ("name", _STR),
+            ]
+        ),
+    ),
+    # Schema should preserve dict insertion order of columns
+    (
+        {"b": "INT", "a": "INT", "c": "INT"},
+        pa.schema([("b", _INT64), ("a", _INT64), ("c", _INT64)]),
+    ),
+]
+
+
+@pytest.mark.parametrize("cols,expected", _BUILD_CASES)
+def test_build_pyarrow_schema_constructs_expected(
+    cols: dict[str, str], expected: pa.Schema
+):
+    """Ensure build_pyarrow_schema maps SQL types to the expected, ordered schema."""
+    assert build_pyarrow_schema(cols) == expected
+
+
+def test_get_current_db_schema_uses_inspector(
+    fake_inspector: _FakeInspector, monkeypatch: pytest.MonkeyPatch
+):
+    """Fake SQLAlchemy inspect to verify columns are returned as name->type string map."""
+    info, n = _make_counter()
+    monkeypatch.setattr("app.utils.schema.logger.info", info)
+
+    invalidate_current_db_schema("dbo", "payments")
+    result = get_current_db_schema(object(), "dbo", "payments")
 
-    reference = {"a": "INT", "b": "VARCHAR(10)", "c": "DATE"}
-    current = {"a": "INT", "b": "VARCHAR(10)", "c": "DATE"}
+    assert result == {"id": "INTEGER", "amount": "DECIMAL(18,2)"}
+    assert fake_inspector.calls == [("payments", "dbo")]
+    assert n[0] >= 1
 
-    info = validate_current_schema(reference, current)
 
-    assert info.new_columns == set()
-    assert info.deleted_columns == set()
-    assert info.columns_to_select == ["a", "b", "c"]
-    mock_warn.assert_not_called()
+def test_get_current_db_schema_is_cached_per_table(fake_inspector: _FakeInspector):
+    """Repeated inspections of a table are served from cache until invalidated."""
+    engine = object()
+    invalidate_current_db_schema("dbo", "orders")
+    first = get_current_db_schema(engine, "dbo", "orders")
+    second = get_current_db_schema(engine, "dbo", "orders")
 
+    assert first == second == {"id": "INTEGER", "amount": "DECIMAL(18,2)"}
+    assert len(fake_inspector.calls) == 1
 
-def test_build_pyarrow_schema_preserves_order():
-    """Schema should preserve dict insertion order of columns."""
-    cols = {"b": "INT", "a": "INT", "c": "INT"}
-    schema = build_pyarrow_schema(cols)
-    assert schema.names == ["b", "a", "c"]
+    invalidate_current_db_schema("dbo", "orders")
+    get_current_db_schema(engine, "dbo", "orders")
+    assert len(fake_inspector.calls) == 2